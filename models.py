@@ -0,0 +1,308 @@
+"""Pydantic models for the Hunter x Nen RPG System API."""
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, Dict, Any
+import secrets
+import string
+import uuid
+from datetime import datetime, timezone
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+_INVITE_ALPHABET = string.ascii_uppercase + string.digits
+
+def generate_invite_code() -> str:
+    return ''.join(secrets.choice(_INVITE_ALPHABET) for _ in range(6))
+
+class ResourceValue(BaseModel):
+    current: int = 10
+    max: int = 10
+
+class Resistances(BaseModel):
+    cortante: int = 0
+    perfurante: int = 0
+    impacto: int = 0
+    elemental: int = 0
+
+class CharacterResources(BaseModel):
+    pv: ResourceValue = Field(default_factory=ResourceValue)
+    pa: ResourceValue = Field(default_factory=ResourceValue)
+    defense: int = 10
+    resistances: Resistances = Field(default_factory=Resistances)
+
+class Attributes(BaseModel):
+    FOR: int = 1
+    VIG: int = 1
+    DEX: int = 1
+    INT: int = 1
+    CAR: int = 1
+
+class FactionReputation(BaseModel):
+    value: int = 0
+    notes: str = ""
+
+class BasicTechniques(BaseModel):
+    ten: str = "Amador"
+    ren: str = "Amador"
+    zetsu: str = "Amador"
+
+class AdvancedTechniques(BaseModel):
+    gyo_perception: bool = Field(default=False, alias="Gyô - Percepção")
+    gyo_attack: bool = Field(default=False, alias="Gyô - Ataque")
+    gyo_defense: bool = Field(default=False, alias="Gyô - Defesa")
+    in_tech: bool = Field(default=False, alias="In")
+    en: bool = Field(default=False, alias="En")
+    shu: bool = Field(default=False, alias="Shu")
+    ken: bool = Field(default=False, alias="Ken")
+
+    # Serialize by alias so the stored/wire shape keeps the Portuguese keys
+    # that existing documents and the client already use
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+class Hatsu(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    name: str = ""
+    type: str = ""
+    category: str = "Base"
+    range: str = ""
+    cost: int = 0
+    duration: str = ""
+    target: str = ""
+    execution: str = ""
+    description: str = ""
+
+class NenSystem(BaseModel):
+    hatsuType: str = ""
+    basicTechniques: BasicTechniques = Field(default_factory=BasicTechniques)
+    advancedTechniques: AdvancedTechniques = Field(default_factory=AdvancedTechniques)
+    hatsus: List[Hatsu] = Field(default_factory=list)
+
+class Weapon(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    name: str = ""
+    damageType: str = "Cortante"
+    damage: str = "1d6"
+    critical: str = "20/x2"
+
+class InventoryItem(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    name: str = ""
+    details: str = ""
+    weight: float = 0
+
+class Lore(BaseModel):
+    originAbility: str = ""
+    history: str = ""
+    personality: str = ""
+    appearance: str = ""
+    objectives: str = ""
+    notes: str = ""
+
+class BeastAbility(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    name: str = ""
+    cost: int = 0
+    description: str = ""
+
+class BeastActions(BaseModel):
+    attack: str = "1d6"
+    heal: str = "1d4"
+
+class BeastResources(BaseModel):
+    pv: ResourceValue = Field(default_factory=ResourceValue)
+    pe: Optional[ResourceValue] = None  # Only for wild beasts
+    resistances: Resistances = Field(default_factory=Resistances)
+
+class Beast(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    type: str = "wild"  # "wild" or "nen"
+    name: str = ""
+    attributes: Attributes = Field(default_factory=Attributes)
+    resources: BeastResources = Field(default_factory=BeastResources)
+    skills: Dict[str, int] = Field(default_factory=dict)
+    actions: BeastActions = Field(default_factory=BeastActions)
+    abilities: List[BeastAbility] = Field(default_factory=list)
+
+class Character(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=_new_id)
+    createdAt: str = Field(default_factory=_now_iso)
+    updatedAt: str = Field(default_factory=_now_iso)
+    userId: Optional[str] = None
+    
+    # Identification
+    name: str = ""
+    level: int = 1
+    origin: str = ""
+    classes: List[str] = Field(default_factory=list)
+    customClass: str = ""
+    
+    # Stats
+    attributes: Attributes = Field(default_factory=Attributes)
+    resources: CharacterResources = Field(default_factory=CharacterResources)
+    skills: Dict[str, int] = Field(default_factory=dict)
+    
+    # Factions
+    factions: Dict[str, FactionReputation] = Field(default_factory=dict)
+    
+    # Nen
+    nen: NenSystem = Field(default_factory=NenSystem)
+    
+    # Equipment
+    weapons: List[Weapon] = Field(default_factory=list)
+    inventory: List[InventoryItem] = Field(default_factory=list)
+    
+    # Lore
+    lore: Lore = Field(default_factory=Lore)
+    classAbility: str = ""
+    
+    # Beasts
+    beasts: List[Beast] = Field(default_factory=list)
+
+class CharacterCreate(BaseModel):
+    name: str
+    userId: Optional[str] = None
+
+class CharacterUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+class RollRecord(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    characterId: str
+    characterName: str
+    rolls: List[int]
+    highest: int
+    attributeValue: int
+    skillBonus: int
+    skillName: str
+    attributeName: str
+    penaltyApplied: bool = False
+    penaltyValue: int = 0
+    baseResult: int
+    finalResult: int
+    isCritical: bool = False
+    isCriticalFail: bool = False
+    timestamp: str = Field(default_factory=_now_iso)
+
+class RollCreate(BaseModel):
+    characterId: str
+    characterName: str
+    rolls: List[int]
+    highest: int
+    attributeValue: int
+    skillBonus: int
+    skillName: str
+    attributeName: str
+    penaltyApplied: bool = False
+    penaltyValue: int = 0
+    baseResult: int
+    finalResult: int
+    isCritical: bool = False
+    isCriticalFail: bool = False
+
+# Threat model for campaigns
+class ThreatCombat(BaseModel):
+    damage: str = "2d8+5"
+
+class Threat(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=_new_id)
+    campaignId: str
+    createdAt: str = Field(default_factory=_now_iso)
+    
+    name: str = ""
+    resources: CharacterResources = Field(default_factory=CharacterResources)
+    attributes: Attributes = Field(default_factory=Attributes)
+    skills: Dict[str, int] = Field(default_factory=lambda: {
+        "Duelo": 0,
+        "Vontade": 0,
+        "Reflexos": 0,
+        "Robustez": 0,
+        "Caça": 0,
+        "Controle de Nen": 0,
+    })
+    dueloAttribute: str = "FOR"
+    nen: NenSystem = Field(default_factory=NenSystem)
+    combat: ThreatCombat = Field(default_factory=ThreatCombat)
+    generalAbilities: str = ""
+
+class ThreatCreate(BaseModel):
+    campaignId: str
+    name: str
+
+class ThreatUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+# ==================== CAMPAIGN MODELS ====================
+
+class CampaignPlayer(BaseModel):
+    odiserId: str
+    odiserName: str
+    odiserEmail: str
+    characterId: str
+    characterName: str = ""
+    joinedAt: str = Field(default_factory=_now_iso)
+
+class Campaign(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
+    id: str = Field(default_factory=_new_id)
+    name: str = ""
+    description: str = ""
+    masterId: str
+    masterName: str = ""
+    masterEmail: str = ""
+    inviteCode: str = Field(default_factory=generate_invite_code)
+    players: List[CampaignPlayer] = Field(default_factory=list)
+    playerIds: List[str] = Field(default_factory=list)
+    createdAt: str = Field(default_factory=_now_iso)
+    updatedAt: str = Field(default_factory=_now_iso)
+
+class CampaignCreate(BaseModel):
+    name: str
+    description: str = ""
+    masterId: str
+    masterName: str = ""
+    masterEmail: str = ""
+
+class CampaignUpdate(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+class CampaignCharacter(BaseModel):
+    """Character copy stored within a campaign - modifications only affect this copy"""
+    model_config = ConfigDict(extra="allow")
+    
+    id: str = Field(default_factory=_new_id)
+    campaignId: str
+    originalCharacterId: str
+    odiserId: str
+    data: Dict[str, Any] = Field(default_factory=dict)
+    createdAt: str = Field(default_factory=_now_iso)
+    updatedAt: str = Field(default_factory=_now_iso)
+
+class JoinCampaignRequest(BaseModel):
+    inviteCode: str
+    odiserId: str
+    odiserName: str
+    odiserEmail: str
+    characterId: str
+
+class CampaignRoll(BaseModel):
+    id: str = Field(default_factory=_new_id)
+    campaignId: str
+    odiserId: str
+    odiserName: str
+    characterName: str
+    rollData: Dict[str, Any]
+    timestamp: str = Field(default_factory=_now_iso)
+
+class CampaignRollCreate(BaseModel):
+    odiserId: str = ""
+    odiserName: str = ""
+    characterName: str = ""
+    rollData: Dict[str, Any] = Field(default_factory=dict)
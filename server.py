@@ -1,25 +1,30 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, ReturnDocument
+from async_lru import alru_cache
+import asyncio
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from pydantic import ValidationError
+from typing import List, Optional, Dict
 import uuid
-from datetime import datetime, timezone
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection — PyMongo's native async client runs queries on the
+# event loop directly (motor routed every call through a thread pool);
+# minPoolSize keeps warm connections so first requests skip the handshake
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(mongo_url, minPoolSize=10)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
-app = FastAPI(title="Hunter x Nen RPG System API")
+app = FastAPI(title="Hunter x Nen RPG System API", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -31,231 +36,102 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def parse_body(request: Request, model):
+    """Parse and validate the raw request body in a single pass.
+
+    model_validate_json lets pydantic-core parse+validate the bytes directly,
+    avoiding FastAPI's json.loads -> dict -> validate double walk.
+    """
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Re-prefix locs with "body" to match FastAPI's native 422 shape
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+        ) from e
+
 # ==================== MODELS ====================
 
-class ResourceValue(BaseModel):
-    current: int = 10
-    max: int = 10
-
-class Resistances(BaseModel):
-    cortante: int = 0
-    perfurante: int = 0
-    impacto: int = 0
-    elemental: int = 0
-
-class CharacterResources(BaseModel):
-    pv: ResourceValue = Field(default_factory=ResourceValue)
-    pa: ResourceValue = Field(default_factory=ResourceValue)
-    defense: int = 10
-    resistances: Resistances = Field(default_factory=Resistances)
-
-class Attributes(BaseModel):
-    FOR: int = 1
-    VIG: int = 1
-    DEX: int = 1
-    INT: int = 1
-    CAR: int = 1
-
-class FactionReputation(BaseModel):
-    value: int = 0
-    notes: str = ""
-
-class BasicTechniques(BaseModel):
-    ten: str = "Amador"
-    ren: str = "Amador"
-    zetsu: str = "Amador"
-
-class AdvancedTechniques(BaseModel):
-    gyo_perception: bool = Field(default=False, alias="Gyô - Percepção")
-    gyo_attack: bool = Field(default=False, alias="Gyô - Ataque")
-    gyo_defense: bool = Field(default=False, alias="Gyô - Defesa")
-    in_tech: bool = Field(default=False, alias="In")
-    en: bool = Field(default=False, alias="En")
-    shu: bool = Field(default=False, alias="Shu")
-    ken: bool = Field(default=False, alias="Ken")
-    
-    model_config = ConfigDict(populate_by_name=True)
-
-class Hatsu(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str = ""
-    type: str = ""
-    category: str = "Base"
-    range: str = ""
-    cost: int = 0
-    duration: str = ""
-    target: str = ""
-    execution: str = ""
-    description: str = ""
-
-class NenSystem(BaseModel):
-    hatsuType: str = ""
-    basicTechniques: BasicTechniques = Field(default_factory=BasicTechniques)
-    advancedTechniques: Dict[str, bool] = Field(default_factory=lambda: {
-        "Gyô - Percepção": False,
-        "Gyô - Ataque": False,
-        "Gyô - Defesa": False,
-        "In": False,
-        "En": False,
-        "Shu": False,
-        "Ken": False,
-    })
-    hatsus: List[Hatsu] = Field(default_factory=list)
-
-class Weapon(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str = ""
-    damageType: str = "Cortante"
-    damage: str = "1d6"
-    critical: str = "20/x2"
-
-class InventoryItem(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str = ""
-    details: str = ""
-    weight: float = 0
-
-class Lore(BaseModel):
-    originAbility: str = ""
-    history: str = ""
-    personality: str = ""
-    appearance: str = ""
-    objectives: str = ""
-    notes: str = ""
-
-class BeastAbility(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str = ""
-    cost: int = 0
-    description: str = ""
-
-class BeastActions(BaseModel):
-    attack: str = "1d6"
-    heal: str = "1d4"
-
-class BeastResources(BaseModel):
-    pv: ResourceValue = Field(default_factory=ResourceValue)
-    pe: Optional[ResourceValue] = None  # Only for wild beasts
-    resistances: Resistances = Field(default_factory=Resistances)
-
-class Beast(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    type: str = "wild"  # "wild" or "nen"
-    name: str = ""
-    attributes: Attributes = Field(default_factory=Attributes)
-    resources: BeastResources = Field(default_factory=BeastResources)
-    skills: Dict[str, int] = Field(default_factory=dict)
-    actions: BeastActions = Field(default_factory=BeastActions)
-    abilities: List[BeastAbility] = Field(default_factory=list)
-
-class Character(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    createdAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updatedAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    userId: Optional[str] = None
-    
-    # Identification
-    name: str = ""
-    level: int = 1
-    origin: str = ""
-    classes: List[str] = Field(default_factory=list)
-    customClass: str = ""
-    
-    # Stats
-    attributes: Attributes = Field(default_factory=Attributes)
-    resources: CharacterResources = Field(default_factory=CharacterResources)
-    skills: Dict[str, int] = Field(default_factory=dict)
-    
-    # Factions
-    factions: Dict[str, FactionReputation] = Field(default_factory=dict)
-    
-    # Nen
-    nen: NenSystem = Field(default_factory=NenSystem)
-    
-    # Equipment
-    weapons: List[Weapon] = Field(default_factory=list)
-    inventory: List[InventoryItem] = Field(default_factory=list)
-    
-    # Lore
-    lore: Lore = Field(default_factory=Lore)
-    classAbility: str = ""
-    
-    # Beasts
-    beasts: List[Beast] = Field(default_factory=list)
-
-class CharacterCreate(BaseModel):
-    name: str
-    userId: Optional[str] = None
-
-class CharacterUpdate(BaseModel):
-    model_config = ConfigDict(extra="allow")
-
-class RollRecord(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    characterId: str
-    characterName: str
-    rolls: List[int]
-    highest: int
-    attributeValue: int
-    skillBonus: int
-    skillName: str
-    attributeName: str
-    penaltyApplied: bool = False
-    penaltyValue: int = 0
-    baseResult: int
-    finalResult: int
-    isCritical: bool = False
-    isCriticalFail: bool = False
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-
-class RollCreate(BaseModel):
-    characterId: str
-    characterName: str
-    rolls: List[int]
-    highest: int
-    attributeValue: int
-    skillBonus: int
-    skillName: str
-    attributeName: str
-    penaltyApplied: bool = False
-    penaltyValue: int = 0
-    baseResult: int
-    finalResult: int
-    isCritical: bool = False
-    isCriticalFail: bool = False
-
-# Threat model for campaigns
-class ThreatCombat(BaseModel):
-    damage: str = "2d8+5"
-
-class Threat(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    campaignId: str
-    createdAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    
-    name: str = ""
-    resources: CharacterResources = Field(default_factory=CharacterResources)
-    attributes: Attributes = Field(default_factory=Attributes)
-    skills: Dict[str, int] = Field(default_factory=lambda: {
-        "Duelo": 0,
-        "Vontade": 0,
-        "Reflexos": 0,
-        "Robustez": 0,
-        "Caça": 0,
-        "Controle de Nen": 0,
-    })
-    dueloAttribute: str = "FOR"
-    nen: NenSystem = Field(default_factory=NenSystem)
-    combat: ThreatCombat = Field(default_factory=ThreatCombat)
-    generalAbilities: str = ""
-
-class ThreatCreate(BaseModel):
-    campaignId: str
-    name: str
+from models import (
+    ResourceValue, Resistances, CharacterResources, Attributes,
+    FactionReputation, BasicTechniques, AdvancedTechniques, Hatsu, NenSystem,
+    Weapon, InventoryItem, Lore, BeastAbility, BeastActions, BeastResources,
+    Beast, Character, CharacterCreate, CharacterUpdate, RollRecord, RollCreate,
+    ThreatCombat, Threat, ThreatCreate, ThreatUpdate,
+    CampaignPlayer, Campaign, CampaignCreate, CampaignUpdate,
+    CampaignCharacter, JoinCampaignRequest, CampaignRoll, CampaignRollCreate,
+    _now_iso,
+)
+
+# Defaults for new characters, built once at import time instead of per request
+DEFAULT_SKILLS: Dict[str, int] = {
+    'Atletismo': 0, 'Duelo': 0, 'Robustez': 0, 'Resistência': 0,
+    'Furtividade': 0, 'Acrobacia': 0, 'Reflexos': 0, 'Pontaria': 0, 'Roubo': 0,
+    'Caça': 0, 'Investigação': 0, 'Medicina': 0, 'Profissão': 0, 'Astúcia': 0,
+    'Persuasão': 0, 'Intimidação': 0, 'Vontade': 0, 'Intuição': 0, 'Tenacidade': 0,
+    'Controle de Nen': 0,
+}
+
+DEFAULT_FACTIONS: Dict[str, dict] = {
+    name: FactionReputation().model_dump()
+    for name in (
+        'hunter_association', 'phantom_troupe', 'zoldyck_family', 'mafia',
+        'world_government', 'chimera_ants', 'kurta_clan', 'ninja_clans',
+        'nen_community', 'specific_kingdoms',
+    )
+}
+
+# Clients re-fetch the same document many times per minute while re-rendering,
+# so cache single-document reads briefly. The short TTL bounds staleness and
+# the PUT/DELETE handlers invalidate eagerly.
+@alru_cache(maxsize=2048, ttl=5)
+async def _fetch_character(character_id: str):
+    return await db.characters.find_one({"id": character_id}, {"_id": 0})
+
+@alru_cache(maxsize=2048, ttl=5)
+async def _fetch_threat(threat_id: str):
+    return await db.threats.find_one({"id": threat_id}, {"_id": 0})
+
+@alru_cache(maxsize=2048, ttl=5)
+async def _fetch_campaign(campaign_id: str):
+    return await db.campaigns.find_one({"id": campaign_id}, {"_id": 0})
+
+# Roll-history list views only render the result summary; projecting the
+# fields below keeps the per-document BSON decode cost down
+ROLL_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "characterId": 1, "characterName": 1,
+    "skillName": 1, "attributeName": 1, "baseResult": 1, "finalResult": 1,
+    "isCritical": 1, "isCriticalFail": 1, "timestamp": 1,
+}
+
+CAMPAIGN_ROLL_LIST_PROJECTION = {
+    "_id": 0, "id": 1, "campaignId": 1, "odiserId": 1, "odiserName": 1,
+    "characterName": 1, "rollData": 1, "timestamp": 1,
+}
+
+# Rolls are the highest-frequency writes (one per dice action). Buffer them
+# briefly and insert in batches so N rolls cost one Mongo round-trip instead
+# of N; the client already has the roll, so the write can complete async.
+_roll_queue: asyncio.Queue = asyncio.Queue()
+_roll_flusher_task: Optional[asyncio.Task] = None
+ROLL_FLUSH_INTERVAL = 0.05
+
+async def _flush_pending_rolls():
+    batches = {}
+    while not _roll_queue.empty():
+        collection, doc = _roll_queue.get_nowait()
+        batches.setdefault(collection.name, (collection, []))[1].append(doc)
+    for collection, docs in batches.values():
+        try:
+            await collection.insert_many(docs, ordered=False)
+        except Exception:
+            logger.exception("Failed to flush %d buffered rolls", len(docs))
+
+async def _roll_flusher():
+    while True:
+        await asyncio.sleep(ROLL_FLUSH_INTERVAL)
+        if not _roll_queue.empty():
+            await _flush_pending_rolls()
 
 # ==================== ROUTES ====================
 
@@ -265,74 +141,76 @@ async def root():
 
 @api_router.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
+    return {"status": "healthy", "timestamp": _now_iso()}
 
 # Character CRUD
-@api_router.post("/characters", response_model=Character)
-async def create_character(input_data: CharacterCreate):
+@api_router.post("/characters", responses={200: {"model": Character}})
+async def create_character(request: Request):
+    input_data = await parse_body(request, CharacterCreate)
     character = Character(name=input_data.name, userId=input_data.userId)
-    
-    # Initialize default skills
-    default_skills = {
-        'Atletismo': 0, 'Duelo': 0, 'Robustez': 0, 'Resistência': 0,
-        'Furtividade': 0, 'Acrobacia': 0, 'Reflexos': 0, 'Pontaria': 0, 'Roubo': 0,
-        'Caça': 0, 'Investigação': 0, 'Medicina': 0, 'Profissão': 0, 'Astúcia': 0,
-        'Persuasão': 0, 'Intimidação': 0, 'Vontade': 0, 'Intuição': 0, 'Tenacidade': 0,
-        'Controle de Nen': 0,
-    }
-    character.skills = default_skills
-    
-    # Initialize default factions
-    default_factions = {
-        'hunter_association': FactionReputation(),
-        'phantom_troupe': FactionReputation(),
-        'zoldyck_family': FactionReputation(),
-        'mafia': FactionReputation(),
-        'world_government': FactionReputation(),
-        'chimera_ants': FactionReputation(),
-        'kurta_clan': FactionReputation(),
-        'ninja_clans': FactionReputation(),
-        'nen_community': FactionReputation(),
-        'specific_kingdoms': FactionReputation(),
-    }
-    character.factions = {k: v.model_dump() for k, v in default_factions.items()}
-    
+
+    # Shallow copies are enough: values are ints / flat dicts
+    character.skills = DEFAULT_SKILLS.copy()
+    character.factions = {k: v.copy() for k, v in DEFAULT_FACTIONS.items()}
+
+    # Dump once: the same dict is inserted and returned (insert_one adds _id)
     doc = character.model_dump()
     await db.characters.insert_one(doc)
-    
-    return character
-
-@api_router.get("/characters", response_model=List[Character])
-async def get_characters(userId: Optional[str] = None, skip: int = 0, limit: int = 50):
+    doc.pop("_id", None)
+    return doc
+
+# List reads return raw motor dicts straight to orjson; the responses=
+# annotations below keep the typed schema in OpenAPI without making FastAPI
+# build and run a list validator per call.
+@api_router.get("/characters", responses={200: {"model": List[Character]}})
+async def get_characters(userId: Optional[str] = None, skip: int = 0, limit: int = 50, fields: Optional[str] = None):
+    """List characters, optionally projecting only the requested fields.
+
+    `fields` is a comma-separated list (list views typically only need
+    `id,name,level,classes,updatedAt`); omitting it returns full documents.
+    Projecting in Mongo cuts both wire bytes and BSON decode time.
+    """
     query = {}
     if userId:
         query["userId"] = userId
-    
+
+    projection = {"_id": 0}
+    if fields:
+        # Skip operator-like names ($foo fails in Mongo) and re-assert the
+        # _id exclusion — a requested _id would return raw ObjectIds that
+        # orjson cannot serialize
+        projection.update({f: 1 for f in fields.split(",") if f and not f.startswith("$")})
+        projection["_id"] = 0
+
     # Limit max results to prevent memory issues
     actual_limit = min(limit, 100)
-    characters = await db.characters.find(query, {"_id": 0}).skip(skip).limit(actual_limit).to_list(actual_limit)
+    # Docs in db.characters were validated on write; skip re-validation on read
+    characters = await db.characters.find(query, projection).skip(skip).limit(actual_limit).to_list(actual_limit)
     return characters
 
-@api_router.get("/characters/{character_id}", response_model=Character)
+@api_router.get("/characters/{character_id}")
 async def get_character(character_id: str):
-    character = await db.characters.find_one({"id": character_id}, {"_id": 0})
+    character = await _fetch_character(character_id)
     if not character:
         raise HTTPException(status_code=404, detail="Character not found")
     return character
 
 @api_router.put("/characters/{character_id}", response_model=Character)
-async def update_character(character_id: str, update_data: dict):
-    update_data["updatedAt"] = datetime.now(timezone.utc).isoformat()
-    
-    result = await db.characters.update_one(
+async def update_character(character_id: str, request: Request):
+    update_data = (await parse_body(request, CharacterUpdate)).model_dump()
+    update_data["updatedAt"] = _now_iso()
+
+    # Single round-trip: update and fetch the new state atomically
+    character = await db.characters.find_one_and_update(
         {"id": character_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.matched_count == 0:
+
+    if character is None:
         raise HTTPException(status_code=404, detail="Character not found")
-    
-    character = await db.characters.find_one({"id": character_id}, {"_id": 0})
+    _fetch_character.cache_invalidate(character_id)
     return character
 
 @api_router.delete("/characters/{character_id}")
@@ -340,23 +218,27 @@ async def delete_character(character_id: str):
     result = await db.characters.delete_one({"id": character_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Character not found")
+    _fetch_character.cache_invalidate(character_id)
     return {"message": "Character deleted successfully"}
 
 # Roll history
-@api_router.post("/rolls", response_model=RollRecord)
-async def create_roll(input_data: RollCreate):
+@api_router.post("/rolls", responses={200: {"model": RollRecord}})
+async def create_roll(request: Request):
+    input_data = await parse_body(request, RollCreate)
     roll = RollRecord(**input_data.model_dump())
     doc = roll.model_dump()
-    await db.rolls.insert_one(doc)
-    return roll
+    # Queue a copy so the flusher's insert can't mutate the response doc
+    _roll_queue.put_nowait((db.rolls, dict(doc)))
+    return doc
 
-@api_router.get("/rolls", response_model=List[RollRecord])
+# No responses= schema here: the projection returns a trimmed RollRecord
+@api_router.get("/rolls")
 async def get_rolls(characterId: Optional[str] = None, limit: int = 50):
     query = {}
     if characterId:
         query["characterId"] = characterId
     
-    rolls = await db.rolls.find(query, {"_id": 0}).sort("timestamp", -1).to_list(limit)
+    rolls = await db.rolls.find(query, ROLL_LIST_PROJECTION).sort("timestamp", -1).to_list(limit)
     return rolls
 
 @api_router.delete("/rolls")
@@ -369,37 +251,41 @@ async def clear_rolls(characterId: Optional[str] = None):
     return {"message": "Roll history cleared"}
 
 # Threats CRUD
-@api_router.post("/threats", response_model=Threat)
-async def create_threat(input_data: ThreatCreate):
+@api_router.post("/threats", responses={200: {"model": Threat}})
+async def create_threat(request: Request):
+    input_data = await parse_body(request, ThreatCreate)
     threat = Threat(campaignId=input_data.campaignId, name=input_data.name)
     doc = threat.model_dump()
     await db.threats.insert_one(doc)
-    return threat
+    doc.pop("_id", None)
+    return doc
 
-@api_router.get("/threats", response_model=List[Threat])
+@api_router.get("/threats", responses={200: {"model": List[Threat]}})
 async def get_threats(campaignId: str, skip: int = 0, limit: int = 50):
     actual_limit = min(limit, 100)
     threats = await db.threats.find({"campaignId": campaignId}, {"_id": 0}).skip(skip).limit(actual_limit).to_list(actual_limit)
     return threats
 
-@api_router.get("/threats/{threat_id}", response_model=Threat)
+@api_router.get("/threats/{threat_id}")
 async def get_threat(threat_id: str):
-    threat = await db.threats.find_one({"id": threat_id}, {"_id": 0})
+    threat = await _fetch_threat(threat_id)
     if not threat:
         raise HTTPException(status_code=404, detail="Threat not found")
     return threat
 
 @api_router.put("/threats/{threat_id}", response_model=Threat)
-async def update_threat(threat_id: str, update_data: dict):
-    result = await db.threats.update_one(
+async def update_threat(threat_id: str, request: Request):
+    update_data = (await parse_body(request, ThreatUpdate)).model_dump()
+    threat = await db.threats.find_one_and_update(
         {"id": threat_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.matched_count == 0:
+
+    if threat is None:
         raise HTTPException(status_code=404, detail="Threat not found")
-    
-    threat = await db.threats.find_one({"id": threat_id}, {"_id": 0})
+    _fetch_threat.cache_invalidate(threat_id)
     return threat
 
 @api_router.delete("/threats/{threat_id}")
@@ -407,6 +293,7 @@ async def delete_threat(threat_id: str):
     result = await db.threats.delete_one({"id": threat_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Threat not found")
+    _fetch_threat.cache_invalidate(threat_id)
     return {"message": "Threat deleted successfully"}
 
 # Import threat from another campaign
@@ -420,137 +307,67 @@ async def import_threat(threat_id: str, target_campaign_id: str):
     new_threat = Threat(**threat)
     new_threat.id = str(uuid.uuid4())
     new_threat.campaignId = target_campaign_id
-    new_threat.createdAt = datetime.now(timezone.utc).isoformat()
+    new_threat.createdAt = _now_iso()
     
     doc = new_threat.model_dump()
     await db.threats.insert_one(doc)
-    return new_threat
-
-# ==================== CAMPAIGN MODELS ====================
-
-class CampaignPlayer(BaseModel):
-    odiserId: str
-    odiserName: str
-    odiserEmail: str
-    characterId: str
-    characterName: str = ""
-    joinedAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-
-class Campaign(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-    
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    name: str = ""
-    description: str = ""
-    masterId: str
-    masterName: str = ""
-    masterEmail: str = ""
-    inviteCode: str = Field(default_factory=lambda: ''.join([chr(65 + (i * 7 + int(str(uuid.uuid4().int)[:2])) % 26) for i in range(6)]))
-    players: List[CampaignPlayer] = Field(default_factory=list)
-    playerIds: List[str] = Field(default_factory=list)
-    createdAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updatedAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-
-class CampaignCreate(BaseModel):
-    name: str
-    description: str = ""
-    masterId: str
-    masterName: str = ""
-    masterEmail: str = ""
-
-class CampaignCharacter(BaseModel):
-    """Character copy stored within a campaign - modifications only affect this copy"""
-    model_config = ConfigDict(extra="allow")
-    
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    campaignId: str
-    originalCharacterId: str
-    odiserId: str
-    data: Dict[str, Any] = Field(default_factory=dict)
-    createdAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updatedAt: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-
-class JoinCampaignRequest(BaseModel):
-    inviteCode: str
-    odiserId: str
-    odiserName: str
-    odiserEmail: str
-    characterId: str
-
-class CampaignRoll(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    campaignId: str
-    odiserId: str
-    odiserName: str
-    characterName: str
-    rollData: Dict[str, Any]
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    doc.pop("_id", None)
+    return doc
 
 # ==================== CAMPAIGN ROUTES ====================
 
-def generate_invite_code():
-    import random
-    import string
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-
 @api_router.post("/campaigns")
-async def create_campaign(input_data: CampaignCreate):
+async def create_campaign(request: Request):
+    input_data = await parse_body(request, CampaignCreate)
     campaign = Campaign(
         name=input_data.name,
         description=input_data.description,
         masterId=input_data.masterId,
         masterName=input_data.masterName,
         masterEmail=input_data.masterEmail,
-        inviteCode=generate_invite_code()
     )
     doc = campaign.model_dump()
     await db.campaigns.insert_one(doc)
-    return campaign
+    doc.pop("_id", None)
+    return doc
 
 @api_router.get("/campaigns")
 async def get_user_campaigns(userId: str, skip: int = 0, limit: int = 50):
     actual_limit = min(limit, 100)
-    
-    # Get campaigns where user is master
-    master_campaigns = await db.campaigns.find(
-        {"masterId": userId}, 
-        {"_id": 0, "id": 1, "name": 1, "description": 1, "inviteCode": 1, "players": 1, "playerIds": 1, "masterId": 1, "masterName": 1}
-    ).skip(skip).limit(actual_limit).to_list(actual_limit)
-    for c in master_campaigns:
-        c["role"] = "master"
-    
-    # Get campaigns where user is player
-    player_campaigns = await db.campaigns.find(
-        {"playerIds": userId}, 
+
+    # One round-trip for both roles; also makes skip/limit paginate the
+    # combined list instead of each half independently
+    campaigns = await db.campaigns.find(
+        {"$or": [{"masterId": userId}, {"playerIds": userId}]},
         {"_id": 0, "id": 1, "name": 1, "description": 1, "inviteCode": 1, "players": 1, "playerIds": 1, "masterId": 1, "masterName": 1}
     ).skip(skip).limit(actual_limit).to_list(actual_limit)
-    for c in player_campaigns:
-        c["role"] = "player"
-    
-    # Combine and return
-    all_campaigns = master_campaigns + player_campaigns
-    return all_campaigns
+    for c in campaigns:
+        c["role"] = "master" if c.get("masterId") == userId else "player"
+
+    return campaigns
 
 @api_router.get("/campaigns/{campaign_id}")
 async def get_campaign(campaign_id: str):
-    campaign = await db.campaigns.find_one({"id": campaign_id}, {"_id": 0})
+    campaign = await _fetch_campaign(campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
 @api_router.put("/campaigns/{campaign_id}")
-async def update_campaign(campaign_id: str, update_data: dict):
-    update_data["updatedAt"] = datetime.now(timezone.utc).isoformat()
-    
-    result = await db.campaigns.update_one(
+async def update_campaign(campaign_id: str, request: Request):
+    update_data = (await parse_body(request, CampaignUpdate)).model_dump()
+    update_data["updatedAt"] = _now_iso()
+
+    campaign = await db.campaigns.find_one_and_update(
         {"id": campaign_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.matched_count == 0:
+
+    if campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    
-    campaign = await db.campaigns.find_one({"id": campaign_id}, {"_id": 0})
+    _fetch_campaign.cache_invalidate(campaign_id)
     return campaign
 
 @api_router.delete("/campaigns/{campaign_id}")
@@ -563,14 +380,19 @@ async def delete_campaign(campaign_id: str, masterId: str):
         raise HTTPException(status_code=403, detail="Only the master can delete the campaign")
     
     await db.campaigns.delete_one({"id": campaign_id})
-    await db.campaign_characters.delete_many({"campaignId": campaign_id})
-    await db.threats.delete_many({"campaignId": campaign_id})
-    await db.campaign_rolls.delete_many({"campaignId": campaign_id})
-    
+    _fetch_campaign.cache_invalidate(campaign_id)
+    # The cascading deletes are independent of each other; run them concurrently
+    await asyncio.gather(
+        db.campaign_characters.delete_many({"campaignId": campaign_id}),
+        db.threats.delete_many({"campaignId": campaign_id}),
+        db.campaign_rolls.delete_many({"campaignId": campaign_id}),
+    )
+
     return {"message": "Campaign deleted successfully"}
 
 @api_router.post("/campaigns/join")
-async def join_campaign(input_data: JoinCampaignRequest):
+async def join_campaign(request: Request):
+    input_data = await parse_body(request, JoinCampaignRequest)
     # Find campaign by invite code
     campaign = await db.campaigns.find_one({"inviteCode": input_data.inviteCode}, {"_id": 0})
     if not campaign:
@@ -612,10 +434,11 @@ async def join_campaign(input_data: JoinCampaignRequest):
                 "playerIds": input_data.odiserId,
                 "players": new_player.model_dump()
             },
-            "$set": {"updatedAt": datetime.now(timezone.utc).isoformat()}
+            "$set": {"updatedAt": _now_iso()}
         }
     )
-    
+    _fetch_campaign.cache_invalidate(campaign["id"])
+
     return {"success": True, "campaignId": campaign["id"], "characterId": campaign_char.id}
 
 @api_router.post("/campaigns/{campaign_id}/leave")
@@ -635,13 +458,14 @@ async def leave_campaign(campaign_id: str, userId: str):
                 "playerIds": userId,
                 "players": {"odiserId": userId}
             },
-            "$set": {"updatedAt": datetime.now(timezone.utc).isoformat()}
+            "$set": {"updatedAt": _now_iso()}
         }
     )
     
     # Remove campaign character
     await db.campaign_characters.delete_many({"campaignId": campaign_id, "odiserId": userId})
-    
+    _fetch_campaign.cache_invalidate(campaign_id)
+
     return {"message": "Left campaign successfully"}
 
 # Campaign Characters
@@ -656,62 +480,65 @@ async def get_campaign_character(campaign_id: str, user_id: str):
     return char
 
 @api_router.put("/campaigns/{campaign_id}/character/{character_id}")
-async def update_campaign_character(campaign_id: str, character_id: str, update_data: dict):
-    update_data["updatedAt"] = datetime.now(timezone.utc).isoformat()
-    
-    result = await db.campaign_characters.update_one(
+async def update_campaign_character(campaign_id: str, character_id: str, request: Request):
+    update_data = (await parse_body(request, CharacterUpdate)).model_dump()
+    # Build the timestamp once and reuse it for both fields
+    now = _now_iso()
+    update_data["updatedAt"] = now
+
+    char = await db.campaign_characters.find_one_and_update(
         {"id": character_id, "campaignId": campaign_id},
-        {"$set": {"data": update_data, "updatedAt": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"data": update_data, "updatedAt": now}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result.matched_count == 0:
+
+    if char is None:
         raise HTTPException(status_code=404, detail="Campaign character not found")
-    
-    char = await db.campaign_characters.find_one({"id": character_id}, {"_id": 0})
     return char
 
 # Campaign Rolls - for master to see
 @api_router.post("/campaigns/{campaign_id}/rolls")
-async def create_campaign_roll(campaign_id: str, roll_data: dict):
+async def create_campaign_roll(campaign_id: str, request: Request):
+    roll_data = await parse_body(request, CampaignRollCreate)
     roll = CampaignRoll(
         campaignId=campaign_id,
-        odiserId=roll_data.get("odiserId", ""),
-        odiserName=roll_data.get("odiserName", ""),
-        characterName=roll_data.get("characterName", ""),
-        rollData=roll_data.get("rollData", {})
+        odiserId=roll_data.odiserId,
+        odiserName=roll_data.odiserName,
+        characterName=roll_data.characterName,
+        rollData=roll_data.rollData
     )
-    await db.campaign_rolls.insert_one(roll.model_dump())
-    return roll
+    doc = roll.model_dump()
+    _roll_queue.put_nowait((db.campaign_rolls, dict(doc)))
+    return doc
 
 @api_router.get("/campaigns/{campaign_id}/rolls")
 async def get_campaign_rolls(campaign_id: str, limit: int = 50):
     rolls = await db.campaign_rolls.find(
         {"campaignId": campaign_id},
-        {"_id": 0}
+        CAMPAIGN_ROLL_LIST_PROJECTION
     ).sort("timestamp", -1).to_list(limit)
     return rolls
 
 # Get all player stats for master view
 @api_router.get("/campaigns/{campaign_id}/player-stats")
 async def get_player_stats(campaign_id: str):
-    # Only fetch needed fields for stats
-    chars = await db.campaign_characters.find(
-        {"campaignId": campaign_id},
-        {"_id": 0, "odiserId": 1, "id": 1, "data.name": 1, "data.resources.pv": 1, "data.resources.pa": 1, "updatedAt": 1}
-    ).to_list(100)
-    
-    stats = []
-    for char in chars:
-        data = char.get("data", {})
-        stats.append({
-            "odiserId": char.get("odiserId"),
-            "characterId": char.get("id"),
-            "characterName": data.get("name", "Unknown"),
-            "pv": data.get("resources", {}).get("pv", {"current": 0, "max": 0}),
-            "pa": data.get("resources", {}).get("pa", {"current": 0, "max": 0}),
-            "updatedAt": char.get("updatedAt")
-        })
-    
+    # Let Mongo reshape the docs so only the final stats hit the wire
+    cursor = await db.campaign_characters.aggregate([
+        {"$match": {"campaignId": campaign_id}},
+        {"$limit": 100},
+        {"$project": {
+            "_id": 0,
+            "odiserId": 1,
+            "characterId": "$id",
+            "characterName": {"$ifNull": ["$data.name", "Unknown"]},
+            "pv": {"$ifNull": ["$data.resources.pv", {"current": 0, "max": 0}]},
+            "pa": {"$ifNull": ["$data.resources.pa", {"current": 0, "max": 0}]},
+            "updatedAt": 1,
+        }},
+    ])
+    stats = await cursor.to_list(100)
+
     return stats
 
 # Include the router in the main app
@@ -725,9 +552,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_db_indexes():
+    # Every route looks documents up by these fields; without indexes Mongo
+    # falls back to full-collection scans
+    await db.characters.create_index("id", unique=True)
+    await db.characters.create_index("userId")
+    await db.threats.create_index("id", unique=True)
+    await db.threats.create_index("campaignId")
+    await db.campaigns.create_index("id", unique=True)
+    await db.campaigns.create_index("inviteCode", unique=True)
+    await db.campaigns.create_index("masterId")
+    await db.campaigns.create_index("playerIds")
+    await db.rolls.create_index([("characterId", 1), ("timestamp", -1)])
+    await db.campaign_rolls.create_index([("campaignId", 1), ("timestamp", -1)])
+    await db.campaign_characters.create_index([("campaignId", 1), ("odiserId", 1)])
+
+@app.on_event("startup")
+async def start_roll_flusher():
+    global _roll_flusher_task
+    _roll_flusher_task = asyncio.create_task(_roll_flusher())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    if _roll_flusher_task is not None:
+        _roll_flusher_task.cancel()
+    # Don't drop rolls that were accepted but not yet written
+    await _flush_pending_rolls()
+    await client.close()
 import uvicorn
 import os
 
@@ -735,5 +587,10 @@ import os
 if __name__ == "__main__":
     # O Render fornece a porta na variável de ambiente PORT
     port = int(os.environ.get("PORT", 8000))
+    # Vários workers para a validação Pydantic não ficar presa num único
+    # processo/GIL; WEB_CONCURRENCY sobrescreve o cálculo padrão
+    workers = int(os.environ.get("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
     # É obrigatório usar host="0.0.0.0"
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # uvloop/httptools cortam o overhead do event loop — o serviço é só I/O
+    # (multi-worker exige o app como string de import, não o objeto)
+    uvicorn.run("server:app", host="0.0.0.0", port=port, workers=workers, loop="uvloop", http="httptools")
\ No newline at end of file